@@ -1,12 +1,14 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ProjectEntity(BaseModel):
     """Проект с компонентами и статусом."""
 
+    model_config = ConfigDict(defer_build=True)
+
     name: str = Field(description="Название проекта")
     status: str = Field(
         description="Статус: Concept, Development, Testing, Production, Archived",
@@ -29,6 +31,8 @@ class ProjectEntity(BaseModel):
 class TechnicalConceptEntity(BaseModel):
     """Техническая концепция или архитектурный паттерн."""
 
+    model_config = ConfigDict(defer_build=True)
+
     name: str = Field(description="Название концепции (Fractal, Graph, Memory, etc)")
     description: str = Field(description="Краткое описание концепции")
     abstraction_level: int = Field(
@@ -48,6 +52,8 @@ class TechnicalConceptEntity(BaseModel):
 class DecisionEntity(BaseModel):
     """Решение, которое может быть переоценено."""
 
+    model_config = ConfigDict(defer_build=True)
+
     decision_text: str = Field(description="Формулировка решения")
     decision_date: datetime = Field(description="Когда было принято решение")
     decision_maker: str = Field("Кто принял решение")
@@ -65,6 +71,8 @@ class DecisionEntity(BaseModel):
 class TeamEntity(BaseModel):
     """Команда или группа людей."""
 
+    model_config = ConfigDict(defer_build=True)
+
     team_name: str = Field(description="Название команды")
     members: List[str] = Field(description="Члены команды")
     focus: str = Field(description="На чём фокусируется команда")
@@ -76,6 +84,9 @@ class TeamEntity(BaseModel):
 
 class L3Summary(BaseModel):
     """Высокоуровневая абстракция или резюме группы эпизодов памяти."""
+
+    model_config = ConfigDict(defer_build=True)
+
     summary_text: str = Field(description="Резюме или абстрактный вывод")
     consolidated_from: List[str] = Field(
         description="UUID эпизодов, на основе которых сделана абстракция",
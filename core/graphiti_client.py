@@ -8,6 +8,7 @@ from graphiti_core import Graphiti
 from neo4j.exceptions import ClientError
 
 from core.migrations import apply_migrations
+from queries.cypher import BULK_FETCH_NODES_QUERY, GRAPH_EXPORT_CYPHER
 from core.embeddings import get_embedding
 from graphiti_core.embedder.client import EmbedderClient
 import logging
@@ -89,10 +90,33 @@ class GraphitiClient:
                         raise
                 # Наши миграции поверх схемы Graphiti (идемпотентно)
                 await apply_migrations(self._graphiti)
+                await self._warm_up_query_plans()
                 self._ready = True
 
         return self._graphiti
 
+    async def _warm_up_query_plans(self) -> None:
+        """
+        EXPLAIN для горячих read-запросов: сервер строит и кэширует план, не выполняя запрос,
+        поэтому первый реальный вызов после (пере)подключения не платит за планирование.
+        """
+        # Сырой neo4j-драйвер: обёртка Graphiti логирует любую ошибку запроса на уровне ERROR
+        # (например, CALL (ns) {} на сервере старше 5.23), а прогрев — оптимизация, не условие готовности
+        driver = self._graphiti.driver
+        client, database = driver.client, driver._database
+        results = await asyncio.gather(
+            client.execute_query(
+                "EXPLAIN " + BULK_FETCH_NODES_QUERY, parameters_={"uuids": []}, database_=database
+            ),
+            client.execute_query(
+                "EXPLAIN " + GRAPH_EXPORT_CYPHER, parameters_={"limit": 1, "edge_limit": 1}, database_=database
+            ),
+            return_exceptions=True,
+        )
+        for res in results:
+            if isinstance(res, Exception):
+                logger.warning(f"Query plan warm-up failed: {res}")
+
     @property
     def raw(self) -> Graphiti:
         """Доступ к исходному клиенту Graphiti (при необходимости)."""
@@ -2,7 +2,7 @@ import asyncio
 import logging
 import random
 import re
-from typing import Callable, TypeVar, Awaitable
+from typing import Callable, TypeVar, Awaitable, Iterator
 
 import openai
 from graphiti_core.llm_client.errors import RateLimitError as GraphitiRateLimitError
@@ -11,6 +11,19 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+_RETRY_AFTER_RE = re.compile(r"Please try again in (\d+(\.\d+)?)s")
+_MAX_BACKOFF_S = 30.0
+
+
+def _backoff_schedule(base_sleep: float) -> Iterator[float]:
+    """Exponential backoff by attempt (1, 2, 4, 8...), capped at 30s; one delay per attempt reached."""
+    delay = base_sleep
+    while True:
+        yield min(delay, _MAX_BACKOFF_S)
+        # Stop doubling at the cap, so a long retry series never overflows
+        if delay < _MAX_BACKOFF_S:
+            delay *= 2
+
 async def with_rate_limit_retry(
     operation: Callable[[], Awaitable[T]],
     *,
@@ -32,6 +45,7 @@ async def with_rate_limit_retry(
         on_rate_limit: Optional callback(sleep_seconds, attempt) to update status
     """
     attempt = 1
+    backoff = _backoff_schedule(base_sleep)
     req_tag = f" [req_id={request_id}]" if request_id else ""
     
     while True:
@@ -42,19 +56,14 @@ async def with_rate_limit_retry(
                 logger.error(f"[{op_name}]{req_tag} Rate limit exceeded, max attempts ({max_attempts}) reached. Error: {e}")
                 raise
 
-            # Determine sleep time
-            sleep_s = 0.0
-            error_msg = str(e)
-            
-            # Try to parse "Please try again in X.Xs" or similar variants
-            match = re.search(r"Please try again in (\d+(\.\d+)?)s", error_msg)
+            # Determine sleep time: server hint "Please try again in X.Xs" wins, else the backoff schedule
+            # (advanced on every attempt, so the fallback delay always matches the attempt number)
+            backoff_s = next(backoff)
+            match = _RETRY_AFTER_RE.search(str(e))
             if match:
                 sleep_s = float(match.group(1)) + 0.5  # Add small buffer
             else:
-                # Exponential backoff: 1, 2, 4, 8...
-                sleep_s = base_sleep * (2 ** (attempt - 1))
-                # Cap at 30s
-                sleep_s = min(sleep_s, 30.0)
+                sleep_s = backoff_s
             
             # Add jitter (0-10% of sleep time)
             jitter = sleep_s * 0.1 * random.random()
@@ -7,8 +7,12 @@ Eliminates duplication of fingerprint, normalize_text, etc.
 
 import hashlib
 import re
+from functools import lru_cache
 from typing import List
 
+_WS_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
 
 def normalize_text(text: str) -> str:
     """
@@ -24,7 +28,10 @@ def normalize_text(text: str) -> str:
     Returns:
         Normalized text string
     """
-    cleaned = re.sub(r"\s+", " ", text.strip())
+    if text.isascii():
+        # Fast path: str.split() collapses and strips whitespace in one C pass
+        return " ".join(text.split()).lower()
+    cleaned = _WS_RE.sub(" ", text.strip())
     return cleaned.lower()
 
 
@@ -40,7 +47,12 @@ def fingerprint(text: str) -> str:
     Returns:
         SHA256 hex digest
     """
-    norm = normalize_text(text)
+    return _sha256_of_normalized(normalize_text(text))
+
+
+@lru_cache(maxsize=16384)
+def _sha256_of_normalized(norm: str) -> str:
+    # Keyed by normalized text: equivalent inputs (and overlapping chunks) hash once
     return hashlib.sha256(norm.encode("utf-8")).hexdigest()
 
 
@@ -134,7 +146,12 @@ def split_into_paragraphs(
         
     Returns:
         List of paragraph strings
+
+    Raises:
+        ValueError: If overlap >= max_len (the window would never advance)
     """
+    if overlap >= max_len:
+        raise ValueError(f"overlap ({overlap}) must be less than max_len ({max_len})")
     parts = []
     for block in text.split("\n\n"):
         blk = block.strip()
@@ -143,14 +160,10 @@ def split_into_paragraphs(
         if len(blk) <= max_len:
             parts.append(blk)
             continue
-        # Split long blocks with overlap
-        start = 0
-        while start < len(blk):
-            end = min(len(blk), start + max_len)
-            parts.append(blk[start:end])
-            if end == len(blk):
-                break
-            start = max(0, end - overlap)
+        # Split long blocks with overlap: chunk starts are known upfront,
+        # the last one is the first whose slice reaches the end of the block
+        step = max_len - overlap
+        parts.extend(blk[i:i + max_len] for i in range(0, len(blk) - overlap, step))
     return parts
 
 
@@ -318,6 +331,7 @@ ENTITY_STOP_WORDS = {
 }
 
 
+@lru_cache(maxsize=8192)
 def normalize_entity_name(name: str) -> str | None:
     """
     Normalize entity name for cross-layer linking.
@@ -338,10 +352,10 @@ def normalize_entity_name(name: str) -> str | None:
     norm = norm.replace('ё', 'е')
     
     # Remove punctuation (keep alphanumeric and spaces)
-    norm = re.sub(r'[^\w\s]', '', norm)
+    norm = _PUNCT_RE.sub('', norm)
     
     # Collapse whitespace
-    norm = re.sub(r'\s+', ' ', norm).strip()
+    norm = _WS_RE.sub(' ', norm).strip()
     
     # Check length and stop words
     if len(norm) < 3:
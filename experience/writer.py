@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from hashlib import sha256
 import json
 from uuid import uuid4
@@ -13,14 +14,22 @@ def _norm(s: str) -> str:
     return " ".join((s or "").strip().lower().split())
 
 
+def _canon(req: ExperienceIngestRequest) -> tuple:
+    # Каноничный hashable-ключ: stack сортируется, порядок ключей не влияет
+    items = tuple(sorted((str(k), str(v)) for k, v in req.stack.items())) if req.stack else ()
+    return (req.repo or "", req.project or "", req.task_type, items)
+
+
+@lru_cache(maxsize=4096)
+def _context_hash(repo: str, project: str, task_type: str, stack_items: tuple) -> str:
+    stack_part = "|".join([f"{k}={v}" for k, v in stack_items])
+    base = "|".join([_norm(repo), _norm(project), _norm(task_type), stack_part])
+    return sha256(base.encode("utf-8")).hexdigest()
+
+
 def compute_context_hash(req: ExperienceIngestRequest) -> str:
     # Минимальный контекст: repo + task_type + stack keys/values
-    stack_part = ""
-    if req.stack:
-        items = sorted((str(k), str(v)) for k, v in req.stack.items())
-        stack_part = "|".join([f"{k}={v}" for k, v in items])
-    base = "|".join([_norm(req.repo or ""), _norm(req.project or ""), _norm(req.task_type), stack_part])
-    return sha256(base.encode("utf-8")).hexdigest()
+    return _context_hash(*_canon(req))
 
 
 def _tool_chain(req: ExperienceIngestRequest) -> list[str]:
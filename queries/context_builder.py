@@ -6,6 +6,8 @@ import logging
 from graphiti_core.search.search_filters import SearchFilters, DateFilter, ComparisonOperator
 from graphiti_core.search.search_config_recipes import COMBINED_HYBRID_SEARCH_RRF
 
+from queries.cypher import BULK_FETCH_NODES_QUERY
+
 logger = logging.getLogger(__name__)
 
 async def build_agent_context(graphiti, entity_name: str, context_size: str = "full") -> Optional[str]:
@@ -77,40 +79,17 @@ async def build_agent_context(graphiti, entity_name: str, context_size: str = "f
 
     node_map: Dict[str, Dict[str, Any]] = {}
     
-    fetch_query = """
-    MATCH (n)
-    WHERE n.uuid IN $uuids
-    RETURN n.uuid as uuid, 
-           labels(n) as labels, 
-           n.name as name, 
-           n.summary as summary, 
-           n.content as content, 
-           n.episode_body as episode_body, 
-           n.source_description as source_description,
-           n.deleted as deleted
-    """
-    
     try:
         if hasattr(driver, 'execute_query'):
-            res = await driver.execute_query(fetch_query, uuids=list(uuids))
+            res = await driver.execute_query(BULK_FETCH_NODES_QUERY, uuids=list(uuids))
             records = res.records
         else:
             async with driver.session() as session:
-                res = await session.run(fetch_query, uuids=list(uuids))
+                res = await session.run(BULK_FETCH_NODES_QUERY, uuids=list(uuids))
                 records = await res.list()
 
-        for record in records:
-            node_data = {
-                "uuid": record["uuid"],
-                "labels": record["labels"],
-                "name": record["name"],
-                "summary": record["summary"],
-                "content": record["content"],
-                "episode_body": record["episode_body"],
-                "source_description": record["source_description"],
-                "deleted": record["deleted"]
-            }
-            node_map[record["uuid"]] = node_data
+        nodes = records[0]["nodes"] if records else []
+        node_map = {node["uuid"]: node for node in nodes}
             
     except Exception as e:
         logger.error(f"Error bulk fetching nodes: {e}")
@@ -0,0 +1,47 @@
+"""
+Тексты горячих read-запросов Cypher.
+
+Листовой модуль без импорта core: его читают и модули запросов/визуализации,
+и прогрев планов в core.graphiti_client.
+"""
+
+# Columnar return: one record holding all nodes instead of one record per node.
+# Module constant so every call sends identical text (Neo4j plan cache hit).
+BULK_FETCH_NODES_QUERY = """
+MATCH (n)
+WHERE n.uuid IN $uuids
+RETURN collect({
+    uuid: n.uuid,
+    labels: labels(n),
+    name: n.name,
+    summary: n.summary,
+    content: n.content,
+    episode_body: n.episode_body,
+    source_description: n.source_description,
+    deleted: n.deleted
+}) AS nodes
+"""
+
+
+# Nodes and edges in one round-trip: two subqueries, each collected into a single list.
+# We limit to Entities and Communities to keep visualization clean,
+# optionally Episodic if needed (but usually too many).
+# Edges are expanded only from the fetched nodes and kept only if both ends are among them,
+# so nothing is sent over Bolt just to be discarded here. Edge maps are shaped for vis.js server-side.
+GRAPH_EXPORT_CYPHER = """
+CALL {
+    MATCH (n)
+    WHERE (n:Entity OR n:Community) AND n.uuid IS NOT NULL
+    WITH n LIMIT $limit
+    RETURN collect(n) AS ns
+}
+CALL (ns) {
+    UNWIND ns AS n
+    MATCH (n)-[r]->(m)
+    WHERE m IN ns
+    WITH n, r, m LIMIT $edge_limit
+    RETURN collect({`from`: n.uuid, `to`: m.uuid, label: type(r), title: coalesce(r.fact, ''), arrows: 'to'}) AS edges
+}
+RETURN [n IN ns | {uuid: n.uuid, name: n.name, labels: labels(n), group_id: n.group_id, summary: n.summary}] AS nodes,
+       edges
+"""
@@ -0,0 +1,88 @@
+"""
+Общие pytest-фикстуры для тестов верхнего уровня.
+"""
+
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def http():
+    """
+    Одна aiohttp-сессия на весь прогон pytest.
+
+    HTTP-харнессы (test_chat_memory_v2, test_chat_stability) переиспользуют
+    пул соединений вместо TCP-хендшейка в каждом тесте.
+    """
+    aiohttp = pytest.importorskip("aiohttp")
+    connector = aiohttp.TCPConnector(limit=64, keepalive_timeout=90)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def long_content():
+    """~20k символов для тестов обрезки контекста; строится один раз за прогон."""
+    return "Very long content " * 1000
+
+
+@pytest.fixture(scope="session")
+def mock_graphiti_factory():
+    """
+    Фабрика свежих моков Graphiti: драйвер с пустым execute_query и AsyncMock add_episode.
+
+    Сама фабрика создаётся один раз за сессию; каждый вызов даёт независимый мок,
+    чтобы side_effect одного теста не протекал в другой.
+    """
+    def _make():
+        driver = MagicMock()
+        driver.execute_query = AsyncMock(return_value=MagicMock(records=[]))
+        return types.SimpleNamespace(driver=driver, add_episode=AsyncMock())
+
+    return _make
+
+
+def _dummy_bulk_import(node_type, properties, id_property):
+    return "MERGE (n) SET n:$(node.labels)"
+
+
+@pytest.fixture(scope="session")
+def _graphiti_stub_modules():
+    """Дерево заглушек graphiti_core строится один раз за сессию."""
+    modules = {
+        name: types.ModuleType(name)
+        for name in (
+            "graphiti_core",
+            "graphiti_core.utils",
+            "graphiti_core.utils.bulk_utils",
+            "graphiti_core.models",
+            "graphiti_core.models.nodes",
+            "graphiti_core.models.nodes.node_db_queries",
+        )
+    }
+    # Связываем пакеты, чтобы работал `from graphiti_core.utils import bulk_utils`
+    for name, module in modules.items():
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(modules[parent], child, module)
+    return modules
+
+
+@pytest.fixture
+def graphiti_stubs(_graphiti_stub_modules, monkeypatch):
+    """
+    Лёгкие заглушки graphiti_core для проверки apply_patches.
+
+    Обычные ModuleType вместо MagicMock, ставятся в sys.modules только на время
+    теста, так что остальные модули видят настоящий graphiti_core.
+    """
+    # apply_patches подменяет функцию на модуле — каждый тест начинает с непропатченной
+    _graphiti_stub_modules["graphiti_core.utils.bulk_utils"].bulk_import_statement_for_node = _dummy_bulk_import
+
+    for name, module in _graphiti_stub_modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return _graphiti_stub_modules
@@ -0,0 +1,40 @@
+"""
+Общие части HTTP-харнессов /chat (test_chat_memory_v2, test_chat_stability).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+import orjson
+
+if TYPE_CHECKING:
+    import aiohttp
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Пауза между запросами (сек); 0 в CI, для ручных прогонов: TEST_PACE_S=0.5
+PACE = float(os.getenv("TEST_PACE_S", "0"))
+
+
+async def read_json(response: aiohttp.ClientResponse) -> Any:
+    """Декодирует тело ответа через orjson, минуя определение кодировки в aiohttp."""
+    return orjson.loads(await response.read())
+
+
+def run_harness(main: Callable[[], Awaitable[None]]) -> None:
+    """
+    Запускает main() харнесса на uvloop (ставится с uvicorn[standard]), иначе — на asyncio.
+
+    uvloop.run есть только с 0.18, а uvicorn[standard] допускает и более старые версии.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    if getattr(uvloop, "run", None) is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
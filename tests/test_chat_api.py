@@ -8,18 +8,27 @@ Usage:
 This will test the /chat, /remember endpoints via HTTP requests.
 """
 
-import requests
+import atexit
+import httpx
 import json
 import sys
 
 API_BASE = "http://localhost:8000"
 
+# Один клиент с keep-alive пулом на весь сеанс. HTTP/2 не включаем:
+# uvicorn обслуживает только HTTP/1.1.
+client = httpx.Client(
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+)
+atexit.register(client.close)
+
 
 def test_remember(text: str, memory_type: str = "personal"):
     """Test /remember endpoint."""
     print(f"💾 Сохранение текста: {text[:50]}...")
     try:
-        response = requests.post(
+        response = client.post(
             f"{API_BASE}/remember",
             json={
                 "text": text,
@@ -43,7 +52,7 @@ def test_chat(message: str, user_id: str = "sergey"):
     """Test /chat endpoint."""
     print(f"💬 Отправка сообщения: {message}")
     try:
-        response = requests.post(
+        response = client.post(
             f"{API_BASE}/chat",
             json={
                 "message": message,
@@ -6,28 +6,48 @@
 import asyncio
 import aiohttp
 import json
+import os
+import orjson
+import pytest
+import sys
+
+# Add project root to path so `import tests.helpers` works when running as a script.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.helpers.chat_harness import JSON_HEADERS, PACE, read_json, run_harness
 
 API_BASE = "http://localhost:8000"
 
-async def test_chat_memory_v2():
-    """Тест новой системы chat memory."""
+# Маркеры в ответах (в нижнем регистре) для проверок тестов 4-6
+SUMMARY_TRIGGERS = ("summary", "обсуждали")
+CORRECTION_TRIGGERS = ("не занимается", "дизайн")
+ARCHETYPE_TRIGGERS = ("архетип", "марк")
+
+
+def _has_any(reply: str, triggers: tuple) -> bool:
+    """Один .lower() на ответ, затем поиск всех маркеров."""
+    lowered = reply.lower()
+    return any(t in lowered for t in triggers)
+
+
+async def run_chat_memory_v2(session: aiohttp.ClientSession) -> bool:
+    """Тест новой системы chat memory на одной общей сессии; False, если API недоступен."""
 
     print("🧪 Testing Chat Memory v2")
     print("=" * 50)
 
     # Проверяем здоровье системы
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{API_BASE}/health", timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"✅ Health: {data}")
-                else:
-                    print(f"❌ Health check failed: {response.status}")
-                    return
+        async with session.get(f"{API_BASE}/health", timeout=10) as response:
+            if response.status == 200:
+                data = await read_json(response)
+                print(f"✅ Health: {data}")
+            else:
+                print(f"❌ Health check failed: {response.status}")
+                return False
     except Exception as e:
         print(f"❌ Health check error: {e}")
-        return
+        return False
 
     print()
 
@@ -40,50 +60,51 @@ async def test_chat_memory_v2():
     ]
 
     for msg in messages:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{API_BASE}/chat",
-                                  json={"message": msg, "user_id": "test_user"},
-                                  timeout=30) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    reply = data.get("reply", "")
-                    print(f"  Q: {msg[:20]}... → {len(reply)} chars")
-                else:
-                    print(f"  ❌ Failed: {response.status}")
-
-        await asyncio.sleep(1)  # Pause between messages
-
-    print("✅ Conversation buffer test completed")
-    print()
-
-    # Тест 2: Memory retrieval
-    print("🧠 Test 2: Memory Retrieval")
-    async with aiohttp.ClientSession() as session:
         async with session.post(f"{API_BASE}/chat",
-                              json={"message": "Что ты знаешь про Лену?", "user_id": "sergey"},
+                              data=orjson.dumps({"message": msg, "user_id": "test_user"}),
+                              headers=JSON_HEADERS,
                               timeout=30) as response:
             if response.status == 200:
-                data = await response.json()
+                data = await read_json(response)
                 reply = data.get("reply", "")
-                print(f"  Memory query result: {len(reply)} chars")
-                print(f"  Preview: {reply[:100]}...")
+                print(f"  Q: {msg[:20]}... → {len(reply)} chars")
             else:
                 print(f"  ❌ Failed: {response.status}")
 
+        if PACE:
+            await asyncio.sleep(PACE)  # Pause between messages
+
+    print("✅ Conversation buffer test completed")
+    print()
+
+    # Тест 2: Memory retrieval
+    print("🧠 Test 2: Memory Retrieval")
+    async with session.post(f"{API_BASE}/chat",
+                          data=orjson.dumps({"message": "Что ты знаешь про Лену?", "user_id": "sergey"}),
+                          headers=JSON_HEADERS,
+                          timeout=30) as response:
+        if response.status == 200:
+            data = await read_json(response)
+            reply = data.get("reply", "")
+            print(f"  Memory query result: {len(reply)} chars")
+            print(f"  Preview: {reply[:100]}...")
+        else:
+            print(f"  ❌ Failed: {response.status}")
+
     print("✅ Memory retrieval test completed")
     print()
 
     # Тест 3: Parallel requests (no blocking)
     print("⚡ Test 3: Parallel Requests (5 concurrent)")
-    async def single_request(i):
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{API_BASE}/chat",
-                                  json={"message": f"Test {i}", "user_id": f"user_{i}"},
-                                  timeout=30) as response:
-                return response.status == 200
-
-    # Запускаем 5 параллельных запросов
-    tasks = [single_request(i) for i in range(5)]
+    async def single_request(session: aiohttp.ClientSession, i: int) -> bool:
+        async with session.post(f"{API_BASE}/chat",
+                              data=orjson.dumps({"message": f"Test {i}", "user_id": f"user_{i}"}),
+                              headers=JSON_HEADERS,
+                              timeout=30) as response:
+            return response.status == 200
+
+    # Запускаем 5 параллельных запросов на общей сессии
+    tasks = [single_request(session, i) for i in range(5)]
     results = await asyncio.gather(*tasks)
 
     successful = sum(results)
@@ -96,34 +117,35 @@ async def test_chat_memory_v2():
     user_id_summary = "test_summary_user"
     for i in range(15):
         msg = f"Сообщение {i+1}: Расскажи о проекте Graphiti"
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{API_BASE}/chat",
-                                  json={"message": msg, "user_id": user_id_summary},
-                                  timeout=30) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if i == 9:  # After 10th turn, summary should be created
-                        print(f"  Turn {i+1}: Summary should be created soon...")
-                    elif i == 14:
-                        print(f"  Turn {i+1}: Final turn")
-                else:
-                    print(f"  ❌ Turn {i+1} failed: {response.status}")
-        await asyncio.sleep(0.5)  # Small delay
-    
-    # Check if summary was created by querying for it
-    async with aiohttp.ClientSession() as session:
         async with session.post(f"{API_BASE}/chat",
-                              json={"message": "Что мы обсуждали?", "user_id": user_id_summary},
+                              data=orjson.dumps({"message": msg, "user_id": user_id_summary}),
+                              headers=JSON_HEADERS,
                               timeout=30) as response:
             if response.status == 200:
-                data = await response.json()
-                reply = data.get("reply", "")
-                if "summary" in reply.lower() or "обсуждали" in reply.lower():
-                    print("  ✅ Chat summary likely created and retrieved")
-                else:
-                    print(f"  ⚠️  Summary check: {reply[:100]}...")
+                data = await read_json(response)
+                if i == 9:  # After 10th turn, summary should be created
+                    print(f"  Turn {i+1}: Summary should be created soon...")
+                elif i == 14:
+                    print(f"  Turn {i+1}: Final turn")
+            else:
+                print(f"  ❌ Turn {i+1} failed: {response.status}")
+        if PACE:
+            await asyncio.sleep(PACE)  # Small delay
+    
+    # Check if summary was created by querying for it
+    async with session.post(f"{API_BASE}/chat",
+                          data=orjson.dumps({"message": "Что мы обсуждали?", "user_id": user_id_summary}),
+                          headers=JSON_HEADERS,
+                          timeout=30) as response:
+        if response.status == 200:
+            data = await read_json(response)
+            reply = data.get("reply", "")
+            if _has_any(reply, SUMMARY_TRIGGERS):
+                print("  ✅ Chat summary likely created and retrieved")
             else:
-                print(f"  ❌ Summary check failed: {response.status}")
+                print(f"  ⚠️  Summary check: {reply[:100]}...")
+        else:
+            print(f"  ❌ Summary check failed: {response.status}")
     
     print("✅ Chat summary test completed")
     print()
@@ -133,61 +155,63 @@ async def test_chat_memory_v2():
     user_id_correction = "test_correction_user"
     
     # First, add some information
-    async with aiohttp.ClientSession() as session:
-        async with session.post(f"{API_BASE}/chat",
-                              json={"message": "Лена занимается контентом", "user_id": user_id_correction},
-                              timeout=30) as response:
-            if response.status == 200:
-                print("  ✅ Initial fact added")
+    async with session.post(f"{API_BASE}/chat",
+                          data=orjson.dumps({"message": "Лена занимается контентом", "user_id": user_id_correction}),
+                          headers=JSON_HEADERS,
+                          timeout=30) as response:
+        if response.status == 200:
+            print("  ✅ Initial fact added")
     
-    await asyncio.sleep(1)
+    if PACE:
+        await asyncio.sleep(PACE)
     
     # Then correct it
-    async with aiohttp.ClientSession() as session:
-        async with session.post(f"{API_BASE}/chat",
-                              json={"message": "Ошибка: Лена НЕ занимается контентом, она дизайнер", "user_id": user_id_correction},
-                              timeout=30) as response:
-            if response.status == 200:
-                print("  ✅ Correction added")
+    async with session.post(f"{API_BASE}/chat",
+                          data=orjson.dumps({"message": "Ошибка: Лена НЕ занимается контентом, она дизайнер", "user_id": user_id_correction}),
+                          headers=JSON_HEADERS,
+                          timeout=30) as response:
+        if response.status == 200:
+            print("  ✅ Correction added")
     
-    await asyncio.sleep(1)
+    if PACE:
+        await asyncio.sleep(PACE)
     
     # Query to verify correction is prioritized
-    async with aiohttp.ClientSession() as session:
-        async with session.post(f"{API_BASE}/chat",
-                              json={"message": "Чем занимается Лена?", "user_id": user_id_correction},
-                              timeout=30) as response:
-            if response.status == 200:
-                data = await response.json()
-                reply = data.get("reply", "")
-                if "не занимается" in reply.lower() or "дизайн" in reply.lower():
-                    print("  ✅ Correction prioritized in context")
-                else:
-                    print(f"  ⚠️  Correction check: {reply[:100]}...")
+    async with session.post(f"{API_BASE}/chat",
+                          data=orjson.dumps({"message": "Чем занимается Лена?", "user_id": user_id_correction}),
+                          headers=JSON_HEADERS,
+                          timeout=30) as response:
+        if response.status == 200:
+            data = await read_json(response)
+            reply = data.get("reply", "")
+            if _has_any(reply, CORRECTION_TRIGGERS):
+                print("  ✅ Correction prioritized in context")
             else:
-                print(f"  ❌ Correction check failed: {response.status}")
+                print(f"  ⚠️  Correction check: {reply[:100]}...")
+        else:
+            print(f"  ❌ Correction check failed: {response.status}")
     
     print("✅ Chat correction test completed")
     print()
 
     # Тест 6: Specific query "архетипы Марка"
     print("🎯 Test 6: Specific Query 'архетипы Марка'")
-    async with aiohttp.ClientSession() as session:
-        async with session.post(f"{API_BASE}/chat",
-                              json={"message": "Какие архетипы у Марка?", "user_id": "sergey"},
-                              timeout=30) as response:
-            if response.status == 200:
-                data = await response.json()
-                reply = data.get("reply", "")
-                print(f"  Query: 'архетипы Марка'")
-                print(f"  Response length: {len(reply)} chars")
-                print(f"  Preview: {reply[:150]}...")
-                if "архетип" in reply.lower() or "марк" in reply.lower():
-                    print("  ✅ Query handled correctly")
-                else:
-                    print("  ⚠️  Query may not have found relevant context")
+    async with session.post(f"{API_BASE}/chat",
+                          data=orjson.dumps({"message": "Какие архетипы у Марка?", "user_id": "sergey"}),
+                          headers=JSON_HEADERS,
+                          timeout=30) as response:
+        if response.status == 200:
+            data = await read_json(response)
+            reply = data.get("reply", "")
+            print(f"  Query: 'архетипы Марка'")
+            print(f"  Response length: {len(reply)} chars")
+            print(f"  Preview: {reply[:150]}...")
+            if _has_any(reply, ARCHETYPE_TRIGGERS):
+                print("  ✅ Query handled correctly")
             else:
-                print(f"  ❌ Query failed: {response.status}")
+                print("  ⚠️  Query may not have found relevant context")
+        else:
+            print(f"  ❌ Query failed: {response.status}")
     
     print("✅ Specific query test completed")
     print()
@@ -201,6 +225,19 @@ async def test_chat_memory_v2():
     print(f"  - Specific queries: ✅ Tested")
     print()
     print("🚀 Chat Memory v2 is ready!")
+    return True
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_chat_memory_v2(http: aiohttp.ClientSession):
+    """Pytest-вход: использует общую сессию из tests/conftest.py."""
+    if not await run_chat_memory_v2(http):
+        pytest.skip("chat API is not reachable")
+
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        await run_chat_memory_v2(session)
+
 
 if __name__ == "__main__":
-    asyncio.run(test_chat_memory_v2())
\ No newline at end of file
+    run_harness(main)
\ No newline at end of file
@@ -6,66 +6,140 @@
 
 import asyncio
 import aiohttp
-import json
+import functools
+import orjson
+import os
+import pytest
 import time
 import sys
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Any
 
+# Add project root to path so `import tests.helpers` works when running as a script.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.helpers.chat_harness import JSON_HEADERS, PACE, read_json, run_harness
+
 API_BASE = "http://localhost:8001"
 
-async def test_chat_request(session: aiohttp.ClientSession, message: str, user_id: str = "sergey", request_id: str = None) -> Dict[str, Any]:
-    """Отправить один запрос к /chat и вернуть результат."""
-    payload = {
-        "message": message,
-        "user_id": user_id
-    }
+# Ограничение одновременных запросов к /chat независимо от числа воркеров
+MAX_CONCURRENT_CHAT = 20
+CHAT_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_CHAT)
+
+# Сколько результатов держим в памяти для отчёта (остальное только в счётчиках)
+HEAD_SIZE = 5
+MAX_FAILURES_KEPT = 50
+
+
+@dataclass
+class Stats:
+    """Онлайн-агрегация результатов: счётчики вместо списка всех ответов."""
+    n: int = 0
+    ok: int = 0
+    total_ms: float = 0.0
+    degraded: int = 0
+    fallback: int = 0
+    head: List[Dict[str, Any]] = field(default_factory=list)
+    failures: deque = field(default_factory=lambda: deque(maxlen=MAX_FAILURES_KEPT))
+
+    def add(self, r: Dict[str, Any]) -> None:
+        self.n += 1
+        self.ok += r["success"]
+        self.total_ms += r["duration_ms"]
+        self.degraded += bool(r.get("degraded"))
+        self.fallback += bool(r.get("fallback"))
+        if len(self.head) < HEAD_SIZE:
+            self.head.append(r)
+        if not r["success"]:
+            self.failures.append(r)
+
+    @property
+    def failed(self) -> int:
+        return self.n - self.ok
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.n if self.n else 0.0
+
+    @property
+    def success_rate(self) -> float:
+        return self.ok / self.n * 100 if self.n else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total": self.n,
+            "successful": self.ok,
+            "failed": self.failed,
+            "avg_time_ms": round(self.avg_ms, 2),
+            "degraded_count": self.degraded,
+            "fallback_count": self.fallback,
+        }
 
-    start_time = time.time()
-    try:
-        async with session.post(f"{API_BASE}/chat", json=payload, timeout=30) as response:
-            end_time = time.time()
-            duration_ms = (end_time - start_time) * 1000
 
-            result = {
+@functools.lru_cache(maxsize=256)
+def _chat_body(message: str, user_id: str) -> bytes:
+    """JSON-тело запроса /chat; сообщения повторяются по кругу, кодируем один раз."""
+    return orjson.dumps({"message": message, "user_id": user_id})
+
+
+def make_session() -> aiohttp.ClientSession:
+    """Одна сессия с общим пулом соединений на весь прогон."""
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=50)
+    return aiohttp.ClientSession(connector=connector)
+
+async def send_chat_request(session: aiohttp.ClientSession, message: str, user_id: str = "sergey", request_id: str = None) -> Dict[str, Any]:
+    """Отправить один запрос к /chat и вернуть результат."""
+    body = _chat_body(message, user_id)
+
+    async with CHAT_SEMAPHORE:
+        start_ns = time.perf_counter_ns()
+        try:
+            async with session.post(f"{API_BASE}/chat", data=body, headers=JSON_HEADERS, timeout=30) as response:
+                duration_us = (time.perf_counter_ns() - start_ns) // 1000
+                duration_ms = duration_us / 1000
+
+                result = {
+                    "request_id": request_id,
+                    "message": message[:50] + "..." if len(message) > 50 else message,
+                    "status_code": response.status,
+                    "duration_ms": round(duration_ms, 2),
+                    "success": response.status == 200
+                }
+
+                if response.status == 200:
+                    try:
+                        data = await read_json(response)
+                        result["reply_length"] = len(data.get("reply", ""))
+                        result["degraded"] = data.get("timing", {}).get("degraded_mode", False)
+                        result["fallback"] = data.get("timing", {}).get("fallback_mode", False)
+                    except:
+                        result["json_error"] = True
+                        result["success"] = False
+                else:
+                    try:
+                        error_text = await response.text()
+                        result["error"] = error_text[:200]
+                    except:
+                        result["error"] = "Failed to read error response"
+
+                return result
+
+        except Exception as e:
+            duration_us = (time.perf_counter_ns() - start_ns) // 1000
+            duration_ms = duration_us / 1000
+            return {
                 "request_id": request_id,
                 "message": message[:50] + "..." if len(message) > 50 else message,
-                "status_code": response.status,
+                "status_code": None,
                 "duration_ms": round(duration_ms, 2),
-                "success": response.status == 200
+                "success": False,
+                "error": str(e)
             }
 
-            if response.status == 200:
-                try:
-                    data = await response.json()
-                    result["reply_length"] = len(data.get("reply", ""))
-                    result["degraded"] = data.get("timing", {}).get("degraded_mode", False)
-                    result["fallback"] = data.get("timing", {}).get("fallback_mode", False)
-                except:
-                    result["json_error"] = True
-                    result["success"] = False
-            else:
-                try:
-                    error_text = await response.text()
-                    result["error"] = error_text[:200]
-                except:
-                    result["error"] = "Failed to read error response"
-
-            return result
-
-    except Exception as e:
-        end_time = time.time()
-        duration_ms = (end_time - start_time) * 1000
-        return {
-            "request_id": request_id,
-            "message": message[:50] + "..." if len(message) > 50 else message,
-            "status_code": None,
-            "duration_ms": round(duration_ms, 2),
-            "success": False,
-            "error": str(e)
-        }
-
-async def test_sequential_requests(num_requests: int = 10) -> List[Dict[str, Any]]:
+async def run_sequential_requests(session: aiohttp.ClientSession, num_requests: int = 10) -> Stats:
     """Тестирование последовательных запросов."""
     print(f"🧪 Testing {num_requests} sequential /chat requests...")
 
@@ -82,28 +156,28 @@ async def test_sequential_requests(num_requests: int = 10) -> List[Dict[str, Any
         "Какие технологии ты используешь?"
     ]
 
-    results = []
+    stats = Stats()
 
-    async with aiohttp.ClientSession() as session:
-        for i in range(num_requests):
-            message = messages[i % len(messages)]
-            request_id = f"seq-{i+1:02d}"
+    for i in range(num_requests):
+        message = messages[i % len(messages)]
+        request_id = f"seq-{i+1:02d}"
 
-            print(f"📤 Request {i+1:2d}: {message[:30]}...")
-            result = await test_chat_request(session, message, request_id=request_id)
-            results.append(result)
+        print(f"📤 Request {i+1:2d}: {message[:30]}...")
+        result = await send_chat_request(session, message, request_id=request_id)
+        stats.add(result)
 
-            if result["success"]:
-                print(f"✅ OK ({result['duration_ms']}ms, reply: {result['reply_length']} chars)")
-            else:
-                print(f"❌ FAIL: {result.get('status_code', 'ERROR')} - {result.get('error', 'Unknown')}")
+        if result["success"]:
+            print(f"✅ OK ({result['duration_ms']}ms, reply: {result['reply_length']} chars)")
+        else:
+            print(f"❌ FAIL: {result.get('status_code', 'ERROR')} - {result.get('error', 'Unknown')}")
 
-            # Небольшая пауза между запросами
-            await asyncio.sleep(0.5)
+        # Небольшая пауза между запросами
+        if PACE:
+            await asyncio.sleep(PACE)
 
-    return results
+    return stats
 
-async def test_parallel_requests(num_concurrent: int = 5, num_requests: int = 15) -> List[Dict[str, Any]]:
+async def run_parallel_requests(session: aiohttp.ClientSession, num_concurrent: int = 5, num_requests: int = 15) -> Stats:
     """Тестирование параллельных запросов."""
     print(f"🧪 Testing {num_requests} requests with {num_concurrent} concurrent...")
 
@@ -125,68 +199,79 @@ async def test_parallel_requests(num_concurrent: int = 5, num_requests: int = 15
         "Какие цели у тебя?"
     ]
 
-    async def worker(worker_id: int, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
-        worker_results = []
-        for i in range(num_requests // num_concurrent + (1 if worker_id < num_requests % num_concurrent else 0)):
-            message = messages[(worker_id + i * num_concurrent) % len(messages)]
-            request_id = f"par-{worker_id+1}-{i+1}"
+    stats = Stats()
+    sem = asyncio.Semaphore(num_concurrent)
 
-            result = await test_chat_request(session, message, request_id=request_id)
-            worker_results.append(result)
+    async def bound(message: str, request_id: str) -> Dict[str, Any]:
+        async with sem:
+            return await send_chat_request(session, message, request_id=request_id)
 
-            # Пауза чтобы не перегружать
-            await asyncio.sleep(0.2)
-
-        return worker_results
-
-    results = []
-
-    async with aiohttp.ClientSession() as session:
-        # Запускаем несколько воркеров параллельно
-        tasks = [worker(i, session) for i in range(num_concurrent)]
-        worker_results = await asyncio.gather(*tasks)
-
-        # Собираем все результаты
-        for worker_result in worker_results:
-            results.extend(worker_result)
-
-    # Сортируем по request_id для читаемого вывода
-    results.sort(key=lambda x: x.get("request_id", ""))
+    # Не больше num_concurrent запросов в полёте; результаты печатаются по мере готовности
+    coros = [
+        bound(messages[i % len(messages)], f"par-{i+1:02d}")
+        for i in range(num_requests)
+    ]
+    for fut in asyncio.as_completed(coros):
+        result = await fut
+        stats.add(result)
 
-    for result in results:
         if result["success"]:
             print(f"✅ {result['request_id']}: OK ({result['duration_ms']}ms)")
         else:
             print(f"❌ {result['request_id']}: FAIL - {result.get('error', 'Unknown')}")
 
-    return results
+    return stats
 
-async def test_health_check() -> Dict[str, Any]:
+async def check_health(session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Проверка здоровья системы."""
     print("🏥 Checking system health...")
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{API_BASE}/health", timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"✅ Health: {data}")
-                    return {"healthy": True, "data": data}
-                else:
-                    error = await response.text()
-                    print(f"❌ Health check failed: {response.status} - {error}")
-                    return {"healthy": False, "status": response.status, "error": error}
+        async with session.get(f"{API_BASE}/health", timeout=10) as response:
+            if response.status == 200:
+                data = await read_json(response)
+                print(f"✅ Health: {data}")
+                return {"healthy": True, "data": data}
+            else:
+                error = await response.text()
+                print(f"❌ Health check failed: {response.status} - {error}")
+                return {"healthy": False, "status": response.status, "error": error}
     except Exception as e:
         print(f"❌ Health check error: {e}")
         return {"healthy": False, "error": str(e)}
 
 async def main():
     """Основная функция тестирования."""
+    async with make_session() as session:
+        await run_stability_tests(session)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_chat_stability(http: aiohttp.ClientSession, tmp_path: Path):
+    """Pytest-вход: использует общую сессию из tests/conftest.py, отчёт пишет во tmp_path."""
+    health = await check_health(http)
+    if not health.get("healthy"):
+        pytest.skip("chat API is not reachable")
+    overall = await run_stability_tests(http, output_dir=tmp_path, health=health)
+    assert overall["successful"] == overall["total_requests"]
+
+
+async def run_stability_tests(
+    session: aiohttp.ClientSession,
+    output_dir: Path = Path("."),
+    health: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """
+    Прогон всех проверок на одной общей сессии; возвращает итоговые счётчики.
+
+    health — уже выполненная проверка здоровья (чтобы не запрашивать /health повторно).
+    """
     print("🚀 Fractal Memory Chat Stability Test")
     print("=" * 50)
 
     # Проверка здоровья системы
-    health = await test_health_check()
+    if health is None:
+        health = await check_health(session)
     if not health.get("healthy"):
         print("⚠️  System health check failed, but continuing with tests...")
 
@@ -195,29 +280,25 @@ async def main():
     # Тест последовательных запросов
     print("📊 SEQUENTIAL REQUESTS TEST")
     print("-" * 30)
-    sequential_results = await test_sequential_requests(10)
+    sequential = await run_sequential_requests(session, 10)
 
     # Анализ результатов последовательного теста
-    successful = sum(1 for r in sequential_results if r["success"])
-    total_time = sum(r["duration_ms"] for r in sequential_results)
-    avg_time = total_time / len(sequential_results)
-
     print("\n📈 Sequential Results:")
-    print(f"   Total: {len(sequential_results)}")
-    print(f"   Successful: {successful}")
-    print(f"   Failed: {len(sequential_results) - successful}")
-    print(f"   Avg time: {avg_time:.2f}ms")
-    print(f"   Success rate: {successful / len(sequential_results) * 100:.1f}%")
+    print(f"   Total: {sequential.n}")
+    print(f"   Successful: {sequential.ok}")
+    print(f"   Failed: {sequential.failed}")
+    print(f"   Avg time: {sequential.avg_ms:.2f}ms")
+    print(f"   Success rate: {sequential.success_rate:.1f}%")
 
     # Проверка на "первый ок, второй падает"
-    first_success = sequential_results[0]["success"] if sequential_results else False
-    second_success = sequential_results[1]["success"] if len(sequential_results) > 1 else False
+    first_success = sequential.head[0]["success"] if sequential.head else False
+    second_success = sequential.head[1]["success"] if len(sequential.head) > 1 else False
 
     if first_success and not second_success:
         print("🔴 PATTERN DETECTED: First request OK, second failed!")
-        for i, result in enumerate(sequential_results[:5]):
+        for i, result in enumerate(sequential.head):
             print(f"   {i+1}: {result['success']} ({result.get('status_code', 'ERROR')})")
-    elif successful == len(sequential_results):
+    elif sequential.ok == sequential.n:
         print("🟢 All sequential requests successful!")
     else:
         print("🟡 Some sequential requests failed")
@@ -227,36 +308,28 @@ async def main():
     # Тест параллельных запросов
     print("📊 PARALLEL REQUESTS TEST")
     print("-" * 30)
-    parallel_results = await test_parallel_requests(5, 15)
+    parallel = await run_parallel_requests(session, 5, 15)
 
     # Анализ результатов параллельного теста
-    successful_parallel = sum(1 for r in parallel_results if r["success"])
-    total_time_parallel = sum(r["duration_ms"] for r in parallel_results)
-    avg_time_parallel = total_time_parallel / len(parallel_results)
-
     print("\n📈 Parallel Results:")
-    print(f"   Total: {len(parallel_results)}")
-    print(f"   Successful: {successful_parallel}")
-    print(f"   Failed: {len(parallel_results) - successful_parallel}")
-    print(f"   Avg time: {avg_time_parallel:.2f}ms")
-    print(f"   Success rate: {successful_parallel / len(parallel_results) * 100:.1f}%")
+    print(f"   Total: {parallel.n}")
+    print(f"   Successful: {parallel.ok}")
+    print(f"   Failed: {parallel.failed}")
+    print(f"   Avg time: {parallel.avg_ms:.2f}ms")
+    print(f"   Success rate: {parallel.success_rate:.1f}%")
     # Проверка degraded mode
-    degraded_count = sum(1 for r in parallel_results if r.get("degraded", False))
-    fallback_count = sum(1 for r in parallel_results if r.get("fallback", False))
-
-    if degraded_count > 0:
-        print(f"   Degraded mode used: {degraded_count} times")
-    if fallback_count > 0:
-        print(f"   Fallback mode used: {fallback_count} times")
+    if parallel.degraded > 0:
+        print(f"   Degraded mode used: {parallel.degraded} times")
+    if parallel.fallback > 0:
+        print(f"   Fallback mode used: {parallel.fallback} times")
 
     # Финальный вердикт
     print()
     print("🎯 FINAL VERDICT")
     print("-" * 20)
 
-    all_results = sequential_results + parallel_results
-    total_successful = sum(1 for r in all_results if r["success"])
-    total_requests = len(all_results)
+    total_successful = sequential.ok + parallel.ok
+    total_requests = sequential.n + parallel.n
 
     if total_successful == total_requests:
         print("🟢 ALL TESTS PASSED - Chat is stable!")
@@ -268,40 +341,35 @@ async def main():
     print(f"   Overall success rate: {total_successful / total_requests * 100:.1f}%")
     # Сохраняем детальные результаты
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results_file = f"chat_stability_test_{timestamp}.json"
-
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            "timestamp": timestamp,
-            "health_check": health,
-            "sequential_test": {
-                "results": sequential_results,
-                "summary": {
-                    "total": len(sequential_results),
-                    "successful": successful,
-                    "failed": len(sequential_results) - successful,
-                    "avg_time_ms": round(avg_time, 2)
-                }
-            },
-            "parallel_test": {
-                "results": parallel_results,
-                "summary": {
-                    "total": len(parallel_results),
-                    "successful": successful_parallel,
-                    "failed": len(parallel_results) - successful_parallel,
-                    "avg_time_ms": round(avg_time_parallel, 2),
-                    "degraded_count": degraded_count,
-                    "fallback_count": fallback_count
-                }
-            },
-            "overall": {
-                "total_requests": total_requests,
-                "successful": total_successful,
-                "success_rate": round(total_successful / total_requests * 100, 1)
-            }
-        }, f, ensure_ascii=False, indent=2)
+    results_file = output_dir / f"chat_stability_test_{timestamp}.json"
+
+    payload = {
+        "timestamp": timestamp,
+        "health_check": health,
+        "sequential_test": {
+            "head": sequential.head,
+            "recent_failures": list(sequential.failures),
+            "summary": sequential.summary()
+        },
+        "parallel_test": {
+            "head": parallel.head,
+            "recent_failures": list(parallel.failures),
+            "summary": parallel.summary()
+        },
+        "overall": {
+            "total_requests": total_requests,
+            "successful": total_successful,
+            "success_rate": round(total_successful / total_requests * 100, 1)
+        }
+    }
+
+    # duration_ms уже округлены при сборке результатов; orjson пишет UTF-8 байты напрямую.
+    # Запись на диск уходит в executor, чтобы не блокировать event loop.
+    data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    await asyncio.get_running_loop().run_in_executor(None, results_file.write_bytes, data)
 
     print(f"📄 Detailed results saved to: {results_file}")
+    return payload["overall"]
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_harness(main)
\ No newline at end of file
@@ -53,6 +53,10 @@ async def test_ingest_chunks_text(mock_graphiti, mock_jobs):
     # First call: processed_chunks=0
     assert calls[0].kwargs['processed_chunks'] == 0
     assert calls[0].kwargs['stage'] == 'ingest'
+
+    # Chunks are ingested sequentially: progress reports chunk index 1..N in order
+    progress = [c.kwargs['processed_chunks'] for c in calls[1:-1] if c.kwargs.get('stage') == 'ingest']
+    assert progress == list(range(1, result["chunks"] + 1))
     
     # Last call: stage='done'
     assert calls[-1].kwargs['stage'] == 'done'
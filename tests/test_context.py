@@ -12,15 +12,34 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from core.graphiti_client import get_graphiti_client
 from core.memory_ops import MemoryOps
 
+# Ленивые кэши: ensure_ready() и MemoryOps создаются один раз на процесс
+_ready = None
+_memory_ops: dict[str, MemoryOps] = {}
+
+
+async def _get_ready():
+    """Возвращает готовый Graphiti, выполняя ensure_ready() только при первом вызове."""
+    global _ready
+    if _ready is None:
+        _ready = await get_graphiti_client().ensure_ready()
+    return _ready
+
+
+async def _get_memory_ops(user_id: str) -> MemoryOps:
+    """MemoryOps для пользователя, кэшированный по user_id."""
+    memory = _memory_ops.get(user_id)
+    if memory is None:
+        memory = _memory_ops[user_id] = MemoryOps(await _get_ready(), user_id)
+    return memory
+
+
 async def test_context():
     """Тест build_context_for_query."""
 
     print("🧪 Testing build_context_for_query...")
 
     # Получаем клиентов
-    graphiti_client = get_graphiti_client()
-    graphiti = await graphiti_client.ensure_ready()
-    memory = MemoryOps(graphiti, "sergey")
+    memory = await _get_memory_ops("sergey")
 
     query = "Лена"
     print(f"Query: '{query}'")
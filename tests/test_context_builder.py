@@ -1,5 +1,9 @@
 import pytest
 from queries.context_builder import build_agent_context
+from queries.cypher import BULK_FETCH_NODES_QUERY
+
+_LABELS = ("Entity",)
+_SUMMARY_FMT = "Summary for %s"
 
 # Mock classes to simulate Graphiti and Neo4j behavior
 
@@ -14,6 +18,8 @@ class DummyEdge:
         self.relationship_type = relationship_type
 
 class DummyRecord:
+    __slots__ = ("_data",)
+
     def __init__(self, data):
         self._data = data
     
@@ -44,39 +50,50 @@ class DummySession:
         return await self.driver.execute_query(query, **kwargs)
 
 class DummyDriver:
+    def __init__(self):
+        # One session reused across calls, like a pooled Neo4j driver
+        self._session = DummySession(self)
+
     async def execute_query(self, query, **kwargs):
-        # Mock bulk fetch response
-        if "MATCH (n)" in query and "$uuids" in query:
-             uuids = kwargs.get("uuids", [])
-             records = []
-             for uuid in uuids:
-                 records.append(DummyRecord({
-                     "uuid": uuid,
-                     "labels": ["Entity"],
-                     "name": "Sergey" if uuid == "src" else "Other",
-                     "summary": f"Summary for {uuid}",
-                     "content": None,
-                     "episode_body": None,
-                     "source_description": "test",
-                     "deleted": False
-                 }))
-             return DummyResult(records)
-        return DummyResult([])
+        handler = _HANDLERS.get(query)
+        return handler(**kwargs) if handler else DummyResult([])
     
     def session(self):
-        return DummySession(self)
+        return self._session
+
+def _handle_bulk_fetch(uuids=(), **kwargs):
+    # Mock bulk fetch response
+    nodes = [
+        {
+            "uuid": u,
+            "labels": _LABELS,
+            "name": "Sergey" if u == "src" else "Other",
+            "summary": _SUMMARY_FMT % u,
+            "content": None,
+            "episode_body": None,
+            "source_description": "test",
+            "deleted": False
+        }
+        for u in uuids
+    ]
+    return DummyResult([DummyRecord({"nodes": nodes})])
+
+# Routing by exact query text instead of substring checks
+_HANDLERS = {BULK_FETCH_NODES_QUERY: _handle_bulk_fetch}
 
 class DummyGraphiti:
     def __init__(self):
         self.driver = DummyDriver()
+        # Canned responses built once; search_ does no per-call allocation
+        self._missing = DummySearchResult(edges=[])
+        self._found = DummySearchResult(edges=[DummyEdge("src", "tgt")])
         
     async def search_(self, query, config=None, search_filter=None):
         if query == "missing":
-             return DummySearchResult(edges=[])
+             return self._missing
         
         # Return a dummy edge
-        edge = DummyEdge("src", "tgt")
-        return DummySearchResult(edges=[edge])
+        return self._found
 
 @pytest.mark.asyncio
 async def test_build_agent_context_returns_none_when_not_found():
@@ -23,34 +23,23 @@ async def test_graphiti_search():
 
     query = "Лена"
 
-    # Тест 1: без group_ids
-    print(f"\n1. Search without group_ids:")
-    results1 = await graphiti.search_(query=query, config=COMBINED_HYBRID_SEARCH_RRF)
-    print(f"   Episodes: {len(results1.episodes)}")
-    print(f"   Nodes: {len(results1.nodes)}")
-    print(f"   Edges: {len(results1.edges)}")
+    # Три поиска независимы — запускаем их параллельно через пул драйвера
+    cases = [
+        ("Search without group_ids", None),
+        ("Search with group_ids=['personal', 'knowledge', 'project']", ['personal', 'knowledge', 'project']),
+        ("Search with group_ids=['personal']", ['personal']),
+    ]
+    results = await asyncio.gather(*(
+        graphiti.search_(query=query, config=COMBINED_HYBRID_SEARCH_RRF, group_ids=group_ids)
+        for _, group_ids in cases
+    ))
+    _, results2, results3 = results
 
-    # Тест 2: с group_ids=['personal', 'knowledge', 'project']
-    print(f"\n2. Search with group_ids=['personal', 'knowledge', 'project']:")
-    results2 = await graphiti.search_(
-        query=query,
-        config=COMBINED_HYBRID_SEARCH_RRF,
-        group_ids=['personal', 'knowledge', 'project']
-    )
-    print(f"   Episodes: {len(results2.episodes)}")
-    print(f"   Nodes: {len(results2.nodes)}")
-    print(f"   Edges: {len(results2.edges)}")
-
-    # Тест 3: с group_ids=['personal']
-    print(f"\n3. Search with group_ids=['personal']:")
-    results3 = await graphiti.search_(
-        query=query,
-        config=COMBINED_HYBRID_SEARCH_RRF,
-        group_ids=['personal']
-    )
-    print(f"   Episodes: {len(results3.episodes)}")
-    print(f"   Nodes: {len(results3.nodes)}")
-    print(f"   Edges: {len(results3.edges)}")
+    for i, ((title, _), res) in enumerate(zip(cases, results), 1):
+        print(f"\n{i}. {title}:")
+        print(f"   Episodes: {len(res.episodes)}")
+        print(f"   Nodes: {len(res.nodes)}")
+        print(f"   Edges: {len(res.edges)}")
 
     # Тест 4: проверим episodes в результатах
     if results2.episodes:
@@ -3,28 +3,29 @@ import sys
 sys.path.append('.')
 from core.graphiti_client import get_graphiti_client
 from knowledge.ingest import ingest_text_document
-from api import create_upload_job, run_ingest_job, get_upload_job
+from api import create_upload_job, get_upload_job
+from app import run_ingest_job
 
 async def test_ingest():
     graphiti_client = get_graphiti_client()
     graphiti = await graphiti_client.ensure_ready()
 
-    # Test direct ingest
-    result = await ingest_text_document(
-        graphiti,
-        "Тестовый документ для проверки ingest",
-        source_description="test",
-        user_id="sergey",
-        group_id="personal"
-    )
-
-    print("Direct ingest result:", result)
-
-    # Test run_ingest_job
+    # Прямой ingest и job независимы — запускаем их параллельно
     job_id = create_upload_job()
     print(f"Created job: {job_id}")
 
-    await run_ingest_job(job_id, "Тестовый документ через job", "test_job", "project")
+    result, _ = await asyncio.gather(
+        ingest_text_document(
+            graphiti,
+            "Тестовый документ для проверки ingest",
+            source_description="test",
+            user_id="sergey",
+            group_id="personal"
+        ),
+        run_ingest_job(job_id, "Тестовый документ через job", "test_job", "project"),
+    )
+
+    print("Direct ingest result:", result)
 
     job_status = get_upload_job(job_id)
     print("Job status:", job_status)
@@ -1,3 +1,5 @@
+import pytest
+
 from knowledge.ingest import fingerprint, normalize_text, split_into_paragraphs
 
 
@@ -17,5 +19,11 @@ def test_split_into_paragraphs_splits_and_overlaps():
     assert parts[0] == "A" * 50
     assert len(parts) > 2
     assert all(1 <= len(p) <= 1000 for p in parts[1:])
+    assert parts[1][-100:] == parts[2][:100]
+    assert parts[-1].endswith("B")
+    assert sum(len(p) for p in parts[1:]) - 100 * (len(parts) - 2) == 5000
 
 
+def test_split_into_paragraphs_rejects_overlap_not_less_than_max_len():
+    with pytest.raises(ValueError):
+        split_into_paragraphs("A" * 50, max_len=100, overlap=100)
@@ -13,6 +13,30 @@ from core.memory_ops import MemoryOps
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("test_linking_int")
 
+_SAME_AS_QUERY = """
+MATCH (e1:Entity {name: $name, group_id: 'group_a'})
+MATCH (e2:Entity {name: $name, group_id: 'group_b'})
+MATCH (e1)-[r:SAME_AS]-(e2)
+RETURN count(r) as links
+"""
+
+# Префиксный фильтр может обслуживаться индексом по :Entity(name), в отличие от CONTAINS
+_DEBUG_QUERY = "MATCH (e:Entity) WHERE e.name STARTS WITH 'LinkTest_' RETURN e.name, e.group_id"
+
+
+async def _poll(fn, timeout=3.0):
+    """Повторяет fn() с экспоненциальной паузой, пока результат не станет истинным."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.05
+    result = await fn()
+    while not result and loop.time() + delay < deadline:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.5)
+        result = await fn()
+    return result
+
+
 async def test_integration():
     client = get_graphiti_client()
     graphiti = await client.ensure_ready()
@@ -20,56 +44,45 @@ async def test_integration():
     unique_name = f"LinkTest_{uuid.uuid4().hex[:6]}"
     logger.info(f"Testing with unique entity name: {unique_name}")
     
-    # 1. Create Episode in 'group_a'
-    logger.info("Adding episode to group_a...")
-    await graphiti.add_episode(
-        name="test_ep_a",
-        episode_body=f"{unique_name} is a test entity in group A. It has property A.",
-        source_description="test",
-        reference_time=datetime.now(timezone.utc),
-        group_id="group_a"
-    )
-    
-    # 2. Create Episode in 'group_b'
-    logger.info("Adding episode to group_b...")
-    await graphiti.add_episode(
-        name="test_ep_b",
-        episode_body=f"{unique_name} is also in group B. It has property B.",
-        source_description="test",
-        reference_time=datetime.now(timezone.utc),
-        group_id="group_b"
+    # 1-2. Create Episodes in 'group_a' and 'group_b' (independent groups, run concurrently)
+    logger.info("Adding episodes to group_a and group_b...")
+    await asyncio.gather(
+        graphiti.add_episode(
+            name="test_ep_a",
+            episode_body=f"{unique_name} is a test entity in group A. It has property A.",
+            source_description="test",
+            reference_time=datetime.now(timezone.utc),
+            group_id="group_a"
+        ),
+        graphiti.add_episode(
+            name="test_ep_b",
+            episode_body=f"{unique_name} is also in group B. It has property B.",
+            source_description="test",
+            reference_time=datetime.now(timezone.utc),
+            group_id="group_b"
+        ),
     )
     
     # 3. Verify SAME_AS
     logger.info("Verifying SAME_AS bridge...")
     driver = graphiti.driver
-    query = """
-    MATCH (e1:Entity {name: $name, group_id: 'group_a'})
-    MATCH (e2:Entity {name: $name, group_id: 'group_b'})
-    MATCH (e1)-[r:SAME_AS]-(e2)
-    RETURN count(r) as links
-    """
-    
     # Retry a few times as extraction/linking might be async or slow? 
     # Actually linking is awaited in add_episode, but extraction is LLM based.
     # LLM might fail to extract the exact name. This is the flaky part.
     # We assume LLM works for simple sentences.
     
-    links = 0
-    for _ in range(3):
-        res = await driver.execute_query(query, name=unique_name)
-        links = res.records[0]['links']
-        if links > 0:
-            break
-        await asyncio.sleep(1)
-        
+    async def check_links():
+        res = await driver.execute_query(_SAME_AS_QUERY, name=unique_name)
+        return res.records[0]['links']
+
+    links = await _poll(check_links)
+
     if links > 0:
         logger.info("✅ SAME_AS bridge created successfully.")
     else:
         logger.error("❌ SAME_AS bridge NOT found.")
-        # Debug: check if entities exist
-        debug_q = "MATCH (e:Entity) WHERE e.name CONTAINS 'LinkTest_' RETURN e.name, e.group_id"
-        d_res = await driver.execute_query(debug_q)
+        # Debug: check if entities exist (once, only after the poll gave up)
+        d_res = await driver.execute_query(_DEBUG_QUERY)
         logger.info(f"Entities found: {[r.data() for r in d_res.records]}")
         return
 
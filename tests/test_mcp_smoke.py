@@ -1,14 +1,39 @@
 import os
-import json
+import re
 import subprocess
 import sys
 
+import orjson
 import pytest
 
 
 def _frame(obj):
-    b = json.dumps(obj, ensure_ascii=False).encode("utf-8")
-    return f"Content-Length: {len(b)}\r\n\r\n".encode("ascii") + b
+    b = orjson.dumps(obj)
+    return b"Content-Length: %d\r\n\r\n%b" % (len(b), b)
+
+
+_CONTENT_LENGTH_RE = re.compile(rb"content-length:\s*(\d+)", re.I)
+
+
+def _read_messages(stream, count):
+    """Read `count` framed messages via read1() into one buffer instead of per-line readline()."""
+    buf = bytearray()
+    start = 0
+    messages = []
+    while len(messages) < count:
+        sep = buf.find(b"\r\n\r\n", start)
+        if sep != -1:
+            m = _CONTENT_LENGTH_RE.search(buf, start, sep)
+            n = int(m.group(1)) if m else 0
+            body_start = sep + 4
+            if len(buf) >= body_start + n:
+                messages.append(orjson.loads(buf[body_start:body_start + n]))
+                start = body_start + n
+                continue
+        chunk = stream.read1(4096)
+        assert chunk
+        buf += chunk
+    return messages
 
 
 @pytest.mark.skipif(
@@ -24,25 +49,16 @@ def test_mcp_initialize_and_tools_list():
         cwd=os.getcwd(),
     )
     try:
-        p.stdin.write(_frame({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}))
-        p.stdin.write(_frame({"jsonrpc": "2.0", "id": 2, "method": "tools/list"}))
+        # both requests in one write
+        payload = (
+            _frame({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+            + _frame({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        )
+        p.stdin.write(payload)
         p.stdin.flush()
 
         # read 2 responses
-        for _ in range(2):
-            headers = {}
-            while True:
-                line = p.stdout.readline()
-                assert line
-                line = line.decode("ascii", "ignore").strip()
-                if not line:
-                    break
-                if ":" in line:
-                    k, v = line.split(":", 1)
-                    headers[k.lower().strip()] = v.strip()
-            n = int(headers.get("content-length", "0"))
-            body = p.stdout.read(n)
-            msg = json.loads(body.decode("utf-8"))
+        for msg in _read_messages(p.stdout, 2):
             assert msg.get("jsonrpc") == "2.0"
     finally:
         p.terminate()
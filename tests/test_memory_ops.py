@@ -4,23 +4,33 @@ Tests for MemoryOps layer.
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, Mock
+from types import SimpleNamespace
 
 from core.memory_ops import MemoryOps, SearchResult, ContextResult
 
 
+class FakeGraphiti:
+    """Minimal Graphiti stand-in: plain coroutines instead of AsyncMock call tracking."""
+
+    def __init__(self):
+        # Disable optional cross-layer expansion logic (it expects a real neo4j driver).
+        self.driver = None
+        self._driver = None
+        self.search_return = DummySearchResults()
+        self.add_episode_calls = []
+
+    async def search_(self, query, **kwargs):
+        return self.search_return
+
+    async def add_episode(self, **kwargs):
+        self.add_episode_calls.append(kwargs)
+        return SimpleNamespace(uuid="ep123")
+
+
 @pytest.fixture
 def mock_graphiti():
-    """Mock Graphiti instance for testing."""
-    graphiti = Mock()
-    graphiti.search_ = AsyncMock()
-    # Make add_episode awaitable and return a dummy result with uuid
-    graphiti.add_episode = AsyncMock(return_value=Mock(uuid="ep123"))
-    
-    # Disable optional cross-layer expansion logic (it expects a real neo4j driver).
-    graphiti.driver = None
-    graphiti._driver = None
-    return graphiti
+    """Fake Graphiti instance for testing."""
+    return FakeGraphiti()
 
 
 @pytest.fixture
@@ -30,6 +40,17 @@ def memory_ops(mock_graphiti):
 
 
 class DummySearchResults:
+    __slots__ = (
+        "episodes",
+        "nodes",
+        "edges",
+        "communities",
+        "episode_reranker_scores",
+        "node_reranker_scores",
+        "edge_reranker_scores",
+        "community_reranker_scores",
+    )
+
     def __init__(
         self,
         *,
@@ -103,10 +124,10 @@ class TestMemoryOps:
         # Verify result and call
         assert result["status"] == "success"
         assert result["uuid"] == "ep123"
-        mock_graphiti.add_episode.assert_called_once()
+        assert len(mock_graphiti.add_episode_calls) == 1
         
         # Verify arguments passed to add_episode
-        call_kwargs = mock_graphiti.add_episode.call_args.kwargs
+        call_kwargs = mock_graphiti.add_episode_calls[0]
         assert call_kwargs["episode_body"] == "test text"
         assert call_kwargs["group_id"] is not None # Should be resolved to personal_group_id (mocked config or default?)
         # Actually resolve_group_id relies on config. 
@@ -115,7 +136,7 @@ class TestMemoryOps:
     @pytest.mark.asyncio
     async def test_search_memory_combines_results(self, memory_ops, mock_graphiti):
         """Test that search_memory combines episodes and entities."""
-        mock_graphiti.search_.return_value = DummySearchResults(
+        mock_graphiti.search_return = DummySearchResults(
             episodes=[DummyEpisode(uuid="ep1", content="episode content with enough length")],
             nodes=[DummyNode(uuid="ent1", name="Entity Name", summary="Entity summary")],
             edges=[DummyEdge(uuid="edge1")],
@@ -137,7 +158,7 @@ class TestMemoryOps:
     @pytest.mark.asyncio
     async def test_build_context_formats_properly(self, memory_ops, mock_graphiti):
         """Test that build_context creates properly formatted context."""
-        mock_graphiti.search_.return_value = DummySearchResults(
+        mock_graphiti.search_return = DummySearchResults(
             episodes=[DummyEpisode(uuid="ep1", content="Test episode content with enough length")],
             nodes=[],
             edges=[],
@@ -155,11 +176,10 @@ class TestMemoryOps:
         assert result.sources["entities"] == 0
 
     @pytest.mark.asyncio
-    async def test_context_truncation(self, memory_ops, mock_graphiti):
+    async def test_context_truncation(self, memory_ops, mock_graphiti, long_content):
         """Test that context is properly truncated for token limits."""
-        # Mock a very long episode
-        long_content = "Very long content " * 1000  # ~20k characters
-        mock_graphiti.search_.return_value = DummySearchResults(
+        # Mock a very long episode (~20k characters, session fixture)
+        mock_graphiti.search_return = DummySearchResults(
             episodes=[DummyEpisode(uuid="ep1", content=long_content)],
             nodes=[],
             edges=[],
@@ -2,60 +2,15 @@ import sys
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 from datetime import datetime
-import asyncio
 
-# --- Mocks for Graphiti Core before import ---
-# Мы должны создать моки до того, как они будут импортированы в тестируемых модулях
-sys.modules["graphiti_core"] = MagicMock()
-sys.modules["graphiti_core.utils"] = MagicMock()
-sys.modules["graphiti_core.utils.bulk_utils"] = MagicMock()
-sys.modules["graphiti_core.models"] = MagicMock()
-sys.modules["graphiti_core.models.nodes"] = MagicMock()
-sys.modules["graphiti_core.models.nodes.node_db_queries"] = MagicMock()
-
-# Mocking the specific function we want to patch
-# We need a real function object for wraps/inspect to work, not just MagicMock
-def dummy_bulk_import(node_type, properties, id_property):
-    return "MERGE (n) SET n:$(node.labels)"
-
-# We need to structure mocks so that imports inside apply_patches work
-# Reset mocks for clean state
-sys.modules.pop("graphiti_core", None)
-sys.modules.pop("graphiti_core.utils", None)
-sys.modules.pop("graphiti_core.utils.bulk_utils", None)
-
-mock_core = MagicMock()
-mock_utils = MagicMock()
-mock_bulk = MagicMock()
-
-# Attach our real dummy function to the mock module
-mock_bulk.bulk_import_statement_for_node = dummy_bulk_import
-
-# Link modules together so 'from graphiti_core.utils import bulk_utils' works
-mock_utils.bulk_utils = mock_bulk
-
-# Re-register in sys.modules
-sys.modules["graphiti_core"] = mock_core
-sys.modules["graphiti_core.utils"] = mock_utils
-sys.modules["graphiti_core.utils.bulk_utils"] = mock_bulk
-
-# Mock models nodes as well
-mock_models = MagicMock()
-mock_nodes = MagicMock()
-mock_queries = MagicMock()
-sys.modules["graphiti_core.models"] = mock_models
-sys.modules["graphiti_core.models.nodes"] = mock_nodes
-sys.modules["graphiti_core.models.nodes.node_db_queries"] = mock_queries
-
-# Now we can import our scripts
 from scripts.apply_patches import apply_patches
 from knowledge.ingest import remember_text, find_similar_episode
 from scripts.consolidate import consolidate_l3_memory
 from core.memory_ops import MemoryOps
 
 # --- Test 1: Verify Patching ---
-def test_apply_patches_fixes_string():
-    # Run patch
+def test_apply_patches_fixes_string(graphiti_stubs):
+    # Run patch (graphiti_core подменён заглушками из conftest)
     apply_patches()
     
     # Execute the function that sits on the mock module
@@ -78,29 +33,28 @@ async def test_semantic_deduplication():
     # Scenario: Vector search finds a match
     mock_driver.execute_query.return_value.records = [{"uuid": "existing-uuid", "score": 0.98}]
     
-    # Mock embeddings to return a vector
-    with patch("knowledge.ingest.get_embedding", new_callable=AsyncMock) as mock_embed:
-        mock_embed.return_value = [0.1, 0.2, 0.3]
+    # Mock embeddings to return a vector and settings to return a group id (one patcher)
+    with patch.multiple(
+        "knowledge.ingest",
+        get_embedding=AsyncMock(return_value=[0.1, 0.2, 0.3]),
+        _get_group_id=MagicMock(return_value="personal"),
+    ):
+        # Execute
+        result = await remember_text(mock_graphiti, "I love pizza", memory_type="personal")
         
-        # Mock settings to return a group id
-        with patch("knowledge.ingest._get_group_id", return_value="personal"):
-            
-            # Execute
-            result = await remember_text(mock_graphiti, "I love pizza", memory_type="personal")
-            
-            # Verify
-            assert result["status"] == "ok"
-            assert result["message"] == "merged with existing memory"
-            assert result["uuid"] == "existing-uuid"
-            
-            # Check that we ran the UPDATE query, not ADD EPISODE
-            # The exact query text check is fragile, checking keywords
-            calls = mock_driver.execute_query.call_args_list
-            update_call = [c for c in calls if "SET e.last_seen_at" in c[0][0]]
-            assert len(update_call) > 0
-            
-            # Ensure we didn't call add_episode (which is on mock_graphiti object)
-            mock_graphiti.add_episode.assert_not_called()
+        # Verify
+        assert result["status"] == "ok"
+        assert result["message"] == "merged with existing memory"
+        assert result["uuid"] == "existing-uuid"
+        
+        # Check that we ran the UPDATE query, not ADD EPISODE
+        # The exact query text check is fragile, checking keywords
+        calls = mock_driver.execute_query.call_args_list
+        update_call = [c for c in calls if "SET e.last_seen_at" in c[0][0]]
+        assert len(update_call) > 0
+        
+        # Ensure we didn't call add_episode (which is on mock_graphiti object)
+        mock_graphiti.add_episode.assert_not_called()
             
     print("\n✅ Test 2: Semantic Deduplication logic works")
 
@@ -148,11 +102,5 @@ async def test_l3_consolidation():
 # Functionality is covered by other tests (test_memory_ops, test_search_memory, test_integration).
 
 if __name__ == "__main__":
-    # Manually run async tests if executed as script
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    test_apply_patches_fixes_string()
-    loop.run_until_complete(test_semantic_deduplication())
-    loop.run_until_complete(test_l3_consolidation())
-    # test_adaptive_search_priority() removed (SimpleAgent deleted)
-    loop.close()
+    # Заглушки graphiti_core ставятся фикстурой, поэтому запускаем через pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -3,15 +3,8 @@ import asyncio
 from unittest.mock import MagicMock, AsyncMock, patch
 import openai
 from knowledge.ingest import ingest_text_document
-from api import UPLOAD_JOBS
-from core.rate_limit_retry import run_with_rate_limit_retry
-
-# Mock Graphiti client
-class MockGraphiti:
-    def __init__(self):
-        self.driver = MagicMock()
-        self.driver.execute_query = AsyncMock(return_value=MagicMock(records=[]))
-        self.add_episode = AsyncMock()
+from api.jobs import create_upload_job, get_upload_job, update_upload_job
+from core.rate_limit_retry import with_rate_limit_retry
 
 @pytest.mark.asyncio
 async def test_retry_wrapper_logic():
@@ -26,7 +19,7 @@ async def test_retry_wrapper_logic():
     
     callback = MagicMock()
     
-    result = await run_with_rate_limit_retry(
+    result = await with_rate_limit_retry(
         lambda: mock_op(),
         op_name="test_op",
         max_attempts=5,
@@ -43,9 +36,52 @@ async def test_retry_wrapper_logic():
 
 
 @pytest.mark.asyncio
-async def test_ingest_flow_with_retry():
+async def test_retry_wrapper_backoff_without_hint():
+    """Without a retry-after hint, delays follow base_sleep * 2^n capped at 30s."""
+    error = openai.RateLimitError(
+        message="Rate limit reached.",
+        response=MagicMock(),
+        body=None
+    )
+    mock_op = AsyncMock(side_effect=[error] * 6 + ["success"])
+
+    with patch("core.rate_limit_retry.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        result = await with_rate_limit_retry(
+            lambda: mock_op(),
+            op_name="test_op",
+            max_attempts=7,
+            base_sleep=2.0
+        )
+
+    assert result == "success"
+    delays = [c.args[0] for c in mock_sleep.await_args_list]
+    expected = [2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+    assert len(delays) == len(expected)
+    # Jitter adds 0-10% on top of the scheduled delay
+    for delay, base in zip(delays, expected):
+        assert base <= delay <= base * 1.1
+
+
+@pytest.mark.asyncio
+async def test_retry_wrapper_large_max_attempts():
+    """A huge max_attempts must not overflow before the first call."""
+    mock_op = AsyncMock(return_value="success")
+
+    result = await with_rate_limit_retry(
+        lambda: mock_op(),
+        op_name="test_op",
+        max_attempts=5000,
+        base_sleep=2.0
+    )
+
+    assert result == "success"
+    assert mock_op.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_ingest_flow_with_retry(mock_graphiti_factory):
     """Test the full ingest flow with mocked Graphiti and RateLimitError."""
-    graphiti = MockGraphiti()
+    graphiti = mock_graphiti_factory()
     
     # 429 Error with specific retry-after
     error_429 = openai.RateLimitError(
@@ -57,25 +93,11 @@ async def test_ingest_flow_with_retry():
     # Fail 2 times, then succeed
     graphiti.add_episode.side_effect = [error_429, error_429, {"uuid": "123", "name": "Success"}]
 
-    job_id = "test_job_retry"
-    UPLOAD_JOBS[job_id] = {
-        "status": "pending", 
-        "stage": "starting",
-        "timing": {}
-    }
-
-    # We patch update_upload_job in api module because ingest.py imports it from there
-    with patch('api.update_upload_job') as mock_update:
-        # We need to simulate the real update_upload_job behavior of updating UPLOAD_JOBS
-        # so that the code doesn't break if it reads back, though ingest mostly writes.
-        # But ingest_text_document calls it.
-        
-        def side_effect_update(jid, **kwargs):
-            if jid in UPLOAD_JOBS:
-                UPLOAD_JOBS[jid].update(kwargs)
-        
-        mock_update.side_effect = side_effect_update
+    job_id = create_upload_job()
 
+    # update_upload_job is imported from api.jobs inside ingest_text_document,
+    # so patching the module attribute is enough; wraps keeps the real job store in sync
+    with patch('api.jobs.update_upload_job', wraps=update_upload_job) as mock_update:
         # Execute
         result = await ingest_text_document(
             graphiti, 
@@ -98,3 +120,6 @@ async def test_ingest_flow_with_retry():
         assert rate_limit_calls[0].kwargs['attempt'] == 1
         assert rate_limit_calls[1].kwargs['attempt'] == 2
 
+    # The real job store saw the updates too
+    assert get_upload_job(job_id)["stage"] == "done"
+
@@ -1,9 +1,24 @@
 import pytest
 from unittest.mock import AsyncMock, Mock
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 from knowledge.ingest import ingest_text_document
 from core.safe_graphiti import filter_graphiti_results
 
+
+def _make_validation_error() -> ValidationError:
+    # A real Pydantic ValidationError for authenticity; it's hard to instantiate without a model,
+    # so validate a dummy model once at import time and reuse the instance.
+    class DummyModel(BaseModel):
+        x: int
+
+    try:
+        DummyModel(x="not an int")
+    except ValidationError as e:
+        return e
+
+
+_VE_INSTANCE = _make_validation_error()
+
 @pytest.mark.asyncio
 async def test_filter_graphiti_results_with_malformed_data():
     # Mock Graphiti result object with some valid and some invalid entities
@@ -51,18 +66,7 @@ async def test_ingest_document_validation_recovery():
     mock_graphiti.driver = mock_driver
     
     # Mock add_episode to raise ValidationError
-    # We use a real Pydantic ValidationError for authenticity if possible, 
-    # but it's hard to instantiate without a model. So we mock it or use a dummy model.
-    from pydantic import BaseModel
-    class DummyModel(BaseModel):
-        x: int
-    
-    try:
-        DummyModel(x="not an int")
-    except ValidationError as e:
-        ve = e
-
-    mock_graphiti.add_episode.side_effect = ve
+    mock_graphiti.add_episode.side_effect = _VE_INSTANCE
     
     # Mock driver.execute_query to find the episode during recovery
     mock_driver.execute_query.return_value = Mock(records=[{"uuid": "recovered-uuid"}])
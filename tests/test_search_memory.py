@@ -4,6 +4,7 @@
 """
 
 import asyncio
+import logging
 import sys
 import os
 
@@ -12,6 +13,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from core.graphiti_client import get_graphiti_client
 from core.memory_ops import MemoryOps
 
+logger = logging.getLogger("test_search_memory")
+
 async def test_search_memory():
     """Тест нового search_memory с Graphiti."""
 
@@ -31,33 +34,36 @@ async def test_search_memory():
         "разработчик"
     ]
 
-    for query in queries:
+    # Запросы независимы — выполняем параллельно, выводим в исходном порядке
+    results = await asyncio.gather(
+        *(memory.search_memory(query, limit=5) for query in queries),
+        return_exceptions=True,
+    )
+
+    for query, result in zip(queries, results):
         print(f"\n🔍 Query: '{query}'")
-        try:
-            result = await memory.search_memory(query, limit=5)
-
-            print(f"  Episodes: {result.total_episodes}")
-            print(f"  Entities: {result.total_entities}")
-            print(f"  Edges: {result.total_edges}")
-            print(f"  Communities: {result.total_communities}")
-
-            # Показываем топ результатов
-            if result.entities:
-                print("  Top entities:")
-                for entity in result.entities[:2]:
-                    print(f"    - {entity.get('name', '')}: {entity.get('summary', '')[:50]}...")
-
-            if result.episodes:
-                print("  Top episodes:")
-                for episode in result.episodes[:2]:
-                    content = episode.get('content', '')[:50]
-                    score = episode.get('score', 0)
-                    print(f"    - Score {score:.2f}: {content}...")
-
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            import traceback
-            traceback.print_exc()
+        if isinstance(result, BaseException):
+            # Сообщение и traceback одним вызовом; pytest перехватит через логирование
+            logger.error("  ❌ Search failed for query %r", query, exc_info=result)
+            continue
+
+        print(f"  Episodes: {result.total_episodes}")
+        print(f"  Entities: {result.total_entities}")
+        print(f"  Edges: {result.total_edges}")
+        print(f"  Communities: {result.total_communities}")
+
+        # Показываем топ результатов
+        if result.entities:
+            print("  Top entities:")
+            for entity in result.entities[:2]:
+                print(f"    - {entity.get('name', '')}: {entity.get('summary', '')[:50]}...")
+
+        if result.episodes:
+            print("  Top episodes:")
+            for episode in result.episodes[:2]:
+                content = episode.get('content', '')[:50]
+                score = episode.get('score', 0)
+                print(f"    - Score {score:.2f}: {content}...")
 
 if __name__ == "__main__":
     asyncio.run(test_search_memory())
\ No newline at end of file
@@ -2,6 +2,7 @@
 import asyncio
 import sys
 import os
+from pathlib import Path
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -28,8 +29,8 @@ async def test_timing():
     else:
         test_file = 'timing_test.txt'
 
-    with open(test_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Read off the event loop so the timing reflects async behaviour
+    content = await asyncio.to_thread(Path(test_file).read_text, encoding='utf-8')
 
     print(f'Content length: {len(content)} characters')
 
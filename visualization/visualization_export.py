@@ -1,11 +1,27 @@
 import asyncio
-import json
 import logging
 
+import orjson
+from neo4j import Query
+
 from core import get_graphiti_client
+from queries.cypher import GRAPH_EXPORT_CYPHER
 
 logger = logging.getLogger(__name__)
 
+# Query-объект: текст один и тот же на каждый вызов (кэш планов Neo4j)
+GRAPH_EXPORT_QUERY = Query(GRAPH_EXPORT_CYPHER)
+
+
+# Highest-priority label wins; anything else renders as a plain Entity
+_TYPE_PRIORITY = ("Community", "Episodic", "User")
+
+
+def _node_type(labels) -> str:
+    label_set = set(labels)
+    return next((t for t in _TYPE_PRIORITY if t in label_set), "Entity")
+
+
 async def export_graph_for_vis(graphiti, limit: int = 500):
     """
     Export graph structure for D3.js/Cytoscape visualization using direct Cypher.
@@ -19,87 +35,45 @@ async def export_graph_for_vis(graphiti, limit: int = 500):
         logger.error("Graphiti driver not found for export")
         return {"nodes": [], "edges": [], "error": "No driver"}
 
-    nodes_map = {}
+    nodes_data = []
     edges_list = []
-
-    # 1. Fetch Nodes (Entities & Communities)
-    # We limit to Entities and Communities to keep visualization clean, 
-    # optionally Episodic if needed (but usually too many).
-    query_nodes = """
-    MATCH (n)
-    WHERE (n:Entity OR n:Community) AND n.uuid IS NOT NULL
-    RETURN n.uuid as uuid, n.name as name, labels(n) as labels, n.group_id as group_id, n.summary as summary
-    LIMIT $limit
-    """
+    node_types = set()
 
     try:
         if hasattr(driver, 'execute_query'):
-            res_nodes = await driver.execute_query(query_nodes, limit=limit)
-            records_nodes = res_nodes.records
+            res = await driver.execute_query(GRAPH_EXPORT_QUERY, limit=limit, edge_limit=limit * 2)
+            record = res.records[0] if res.records else None
         else:
+            # The query yields a single columnar row; read it directly instead of buffering a list
             async with driver.session() as session:
-                res_nodes = await session.run(query_nodes, limit=limit)
-                records_nodes = await res_nodes.list()
-
-        for rec in records_nodes:
-            uuid = rec['uuid']
-            labels = rec['labels']
-            node_type = "Entity"
-            if "Community" in labels:
-                node_type = "Community"
-            elif "Episodic" in labels:
-                node_type = "Episodic"
-            elif "User" in labels:
-                node_type = "User"
-            
-            nodes_map[uuid] = {
-                "id": str(uuid),
-                "label": rec['name'] or f"{node_type}:{uuid[:4]}",
+                res = await session.run(GRAPH_EXPORT_QUERY, limit=limit, edge_limit=limit * 2)
+                record = await res.single()
+
+        node_rows = record["nodes"] if record else []
+        edge_rows = record["edges"] if record else []
+
+        # Types first (one pass), then nodes as a single comprehension
+        types = [_node_type(rec['labels']) for rec in node_rows]
+        node_types = set(types)
+        # Nodes are distinct per MATCH and edges are filtered server-side,
+        # so the list is built at its final size with no uuid map to copy from
+        nodes_data = [
+            {
+                "id": str(rec['uuid']),
+                "label": rec['name'] or f"{node_type}:{rec['uuid'][:4]}",
                 "title": rec['summary'] or "",
                 "type": node_type,
                 "group": rec['group_id'] or "default",
                 "size": 30 if node_type == "Community" else 20
             }
+            for rec, node_type in zip(node_rows, types)
+        ]
 
-    except Exception as e:
-        logger.error(f"Error exporting nodes: {e}")
-
-    # 2. Fetch Edges
-    # We only fetch edges where both source and target are in our fetched nodes map
-    query_edges = """
-    MATCH (n)-[r]->(m)
-    WHERE n.uuid IS NOT NULL AND m.uuid IS NOT NULL
-    RETURN n.uuid as source, m.uuid as target, type(r) as type, r.fact as fact
-    LIMIT $limit
-    """
-
-    try:
-        if hasattr(driver, 'execute_query'):
-            res_edges = await driver.execute_query(query_edges, limit=limit * 2)
-            records_edges = res_edges.records
-        else:
-            async with driver.session() as session:
-                res_edges = await session.run(query_edges, limit=limit * 2)
-                records_edges = await res_edges.list()
-
-        for rec in records_edges:
-            src = rec['source']
-            tgt = rec['target']
-            
-            # Filter edges to only those connecting nodes we have
-            if src in nodes_map and tgt in nodes_map:
-                edges_list.append({
-                    "from": str(src),
-                    "to": str(tgt),
-                    "label": rec['type'],
-                    "title": rec['fact'] or "",
-                    "arrows": "to"
-                })
+        # Edge maps already come back in vis.js shape; no per-edge dict is rebuilt here
+        edges_list = edge_rows
 
     except Exception as e:
-        logger.error(f"Error exporting edges: {e}")
-
-    nodes_data = list(nodes_map.values())
+        logger.error(f"Error exporting graph: {e}")
 
     return {
         "nodes": nodes_data,
@@ -107,15 +81,16 @@ async def export_graph_for_vis(graphiti, limit: int = 500):
         "statistics": {
             "total_nodes": len(nodes_data),
             "total_edges": len(edges_list),
-            "node_types": list(set(n["type"] for n in nodes_data)),
+            "node_types": list(node_types),
         },
     }
 
 
 async def export_to_file(graphiti, filename: str = "visualization/graph_data.json"):
     data = await export_graph_for_vis(graphiti)
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # orjson emits UTF-8 bytes directly (no ensure_ascii pass of the stdlib encoder)
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     print(f"✅ Exported to {filename}")
     print(f"   Nodes: {data['statistics']['total_nodes']}")
     print(f"   Edges: {data['statistics']['total_edges']}")